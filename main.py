@@ -9,11 +9,1026 @@ import threading
 from pathlib import Path
 import queue
 import gc
+import io
+import collections
+import argparse
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import multiprocessing
 
-class CSVFilterApp:
-    def __init__(self, root):
+# Optional: Arrow-backed strings are much smaller than Python str objects
+try:
+    import pyarrow
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+class ResourceLimiter:
+    """Caps concurrent CPU work and concurrent disk I/O per storage device"""
+    def __init__(self, cpu_slots, io_slots_per_device):
+        self.cpu = threading.BoundedSemaphore(max(1, cpu_slots))
+        self.io_slots_per_device = max(1, io_slots_per_device)
+        self.device_slots = {}
+        self.lock = threading.Lock()
+    
+    def device_for(self, path):
+        """Device id of a path (or its nearest existing parent)"""
+        path = Path(path).resolve()
+        while not path.exists() and path != path.parent:
+            path = path.parent
+        return os.stat(path).st_dev
+    
+    def io(self, path):
+        """Semaphore guarding disk reads/writes on the device holding `path`"""
+        # Files on one device share its slots, so readers don't thrash one disk
+        device = self.device_for(path)
+        with self.lock:
+            if device not in self.device_slots:
+                self.device_slots[device] = threading.BoundedSemaphore(self.io_slots_per_device)
+            return self.device_slots[device]
+
+class BlockStream(io.RawIOBase):
+    """Readable stream fed with raw byte blocks from another thread"""
+    def __init__(self, capacity, stop):
+        super().__init__()
+        self.capacity = capacity  # Buffered bytes before feed() waits (backpressure)
+        self.stop = stop
+        self.blocks = collections.deque()
+        self.buffered = 0
+        self.consumed = 0
+        self.eof = False
+        self.ready = threading.Condition()
+    
+    def readable(self):
+        return True
+    
+    def wait(self, predicate):
+        # Poll the stop flag so a failed stage never leaves us blocked
+        while not predicate() and not self.stop.is_set():
+            self.ready.wait(timeout=0.1)
+    
+    def feed(self, data):
+        """Append a block (b'' marks the end); False if the pipeline stopped"""
+        with self.ready:
+            self.wait(lambda: self.buffered < self.capacity)
+            if self.stop.is_set():
+                return False
+            if data:
+                self.blocks.append(memoryview(data))
+                self.buffered += len(data)
+            else:
+                self.eof = True
+            self.ready.notify_all()
+            return True
+    
+    def wait_for(self, nbytes):
+        """Block until `nbytes` are buffered or the input is exhausted"""
+        with self.ready:
+            self.wait(lambda: self.eof or self.buffered >= min(nbytes, self.capacity))
+    
+    def readinto(self, buffer):
+        with self.ready:
+            self.wait(lambda: self.blocks or self.eof)
+            if not self.blocks:
+                return 0
+            block = self.blocks[0]
+            size = min(len(buffer), len(block))
+            buffer[:size] = block[:size]
+            if size == len(block):
+                self.blocks.popleft()
+            else:
+                self.blocks[0] = block[size:]
+            self.buffered -= size
+            self.consumed += size
+            self.ready.notify_all()
+            return size
+
+class SchemaConflict(Exception):
+    """A later chunk's column types can't be written like the earlier chunks'"""
+    def __init__(self, overrides):
+        super().__init__(f"Column types changed mid-file: {', '.join(map(str, overrides))}")
+        self.overrides = overrides
+
+class CSVFilterEngine:
+    """CSV filtering without any UI, shared by the GUI and headless runs"""
+    def __init__(self):
+        self.progress_queue = queue.Queue()
+        
+        # Get optimal number of workers
+        self.num_workers = min(multiprocessing.cpu_count(), 4)
+    
+    def set_file_status(self, file_index, status):
+        """Report per-file status (the GUI shows it next to the file row)"""
+        pass
+    
+    def infer_compact_dtypes(self, input_file, sample_rows=20000):
+        """Sample the file once and pick compact dtypes for each column"""
+        sample = pd.read_csv(
+            input_file,
+            nrows=sample_rows,
+            encoding='utf-8-sig',
+            engine='c',
+            low_memory=False,
+            na_values=['', ' ', '  '],
+            keep_default_na=True
+        )
+        
+        # Numbers keep default inference: the parser silently wraps values that
+        # overflow an explicit integer dtype, so ints are downcast per chunk instead
+        dtypes = {}
+        for column in sample.columns:
+            series = sample[column]
+            if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+                non_null = series.dropna()
+                if len(non_null) and non_null.nunique() / len(non_null) < 0.5:
+                    dtypes[column] = 'category'
+                elif HAS_PYARROW:
+                    dtypes[column] = 'string[pyarrow]'
+        
+        del sample
+        return dtypes
+    
+    def downcast_integers(self, chunk):
+        """Shrink signed integer columns to the smallest type that fits this chunk"""
+        for column in chunk.columns:
+            # uint64 columns hold values past int64 max; leave them as parsed
+            if pd.api.types.is_signed_integer_dtype(chunk[column]):
+                chunk[column] = pd.to_numeric(chunk[column], downcast='integer')
+        return chunk
+    
+    def column_kind(self, series):
+        """Coarse type of a column for output formatting: 'b', 'i', 'f' or 'O'"""
+        if pd.api.types.is_bool_dtype(series):
+            return 'b'
+        if pd.api.types.is_integer_dtype(series):
+            return 'i'
+        if pd.api.types.is_float_dtype(series):
+            return 'f'
+        return 'O'
+    
+    def align_to_schema(self, chunk, schema):
+        """Cast a chunk so each column is written like it was in earlier chunks"""
+        # The first non-blank occurrence of a column pins its kind in `schema`;
+        # int+blank -> Int64, int+float -> float64, anything else is a conflict
+        conflicts = {}
+        for column in chunk.columns:
+            series = chunk[column]
+            if series.isna().all():
+                continue  # Blanks are written the same whatever the dtype
+            kind = self.column_kind(series)
+            pinned = schema.setdefault(column, kind)
+            if kind == pinned:
+                continue
+            if pinned == 'f' and kind == 'i':
+                chunk[column] = series.astype('float64')
+            elif pinned == 'i' and kind == 'f' and (series.dropna() % 1 == 0).all():
+                chunk[column] = series.astype('Int64')
+            elif pinned == 'i' and kind == 'f':
+                conflicts[column] = 'float64'
+            else:
+                # Mixed text and values: keep the raw text throughout
+                conflicts[column] = str
+        
+        if conflicts:
+            raise SchemaConflict(conflicts)
+        return chunk
+    
+    def filter_chunk(self, chunk, input_file):
+        """Return the rows of a chunk with a non-empty First Name, plus the mask"""
+        if 'First Name' not in chunk.columns:
+            raise ValueError(f"Column 'First Name' not found in {os.path.basename(input_file)}")
+        
+        # Vectorized operation for better performance
+        first_name_col = chunk['First Name']
+        mask = first_name_col.notna() & (first_name_col.astype(str).str.strip() != '')
+        return chunk.loc[mask], mask
+    
+    def run_filter_pipeline(self, input_file, output_file, chunk_size, dtype=None,
+                            collect_mask=False, queue_depth=2, limiter=None,
+                            read_block=4 * 1024 * 1024, downcast=False):
+        """Stream a CSV through concurrent reader, filter and writer stages"""
+        # Bounded queues give backpressure; block reads and writes take an I/O
+        # slot on their device, parsing and formatting take a CPU slot
+        limiter = limiter or ResourceLimiter(self.num_workers, 2)
+        read_slots = limiter.io(input_file)
+        write_slots = limiter.io(output_file)
+        
+        read_queue = queue.Queue(maxsize=queue_depth)
+        write_queue = queue.Queue(maxsize=queue_depth)
+        stop = threading.Event()
+        errors = []
+        done = object()  # End-of-stream marker
+        
+        def put(target, item):
+            # Give up if another stage failed, instead of blocking forever
+            while not stop.is_set():
+                try:
+                    target.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def get(source):
+            while not stop.is_set():
+                try:
+                    return source.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+            return done
+        
+        def fetch_stage():
+            try:
+                with open(input_file, 'rb') as f:
+                    while True:
+                        with read_slots:
+                            data = f.read(read_block)
+                        if not stream.feed(data) or not data:
+                            return
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        def reader_stage():
+            try:
+                # Use engine='c' for faster parsing
+                reader = pd.read_csv(
+                    io.BufferedReader(stream),
+                    chunksize=chunk_size,
+                    encoding='utf-8-sig',
+                    engine='c',  # C engine is faster
+                    low_memory=False,
+                    na_values=['', ' ', '  '],
+                    keep_default_na=True,
+                    dtype=dtype
+                )
+                chunk_bytes = stream.capacity
+                while True:
+                    # Wait for input before taking a CPU slot, so a slow disk
+                    # doesn't hold one idle
+                    stream.wait_for(chunk_bytes)
+                    consumed = stream.consumed
+                    with limiter.cpu:
+                        chunk = next(reader, None)
+                        if chunk is not None:
+                            chunk = self.align_to_schema(chunk, schema)
+                            if downcast:
+                                chunk = self.downcast_integers(chunk)
+                    if chunk is None:
+                        break
+                    chunk_bytes = max(stream.consumed - consumed, read_block)
+                    if not put(read_queue, chunk):
+                        return
+                put(read_queue, done)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        def filter_stage():
+            try:
+                while True:
+                    chunk = get(read_queue)
+                    if chunk is done:
+                        break
+                    first_chunk = not stats['chunks']
+                    with limiter.cpu:
+                        filtered_chunk, mask = self.filter_chunk(chunk, input_file)
+                        # Format here so the writer only holds its slot for the bytes
+                        text = None
+                        if first_chunk or not filtered_chunk.empty:
+                            text = filtered_chunk.to_csv(index=False, header=first_chunk)
+                    stats['chunks'] += 1
+                    stats['captured'] += len(filtered_chunk)
+                    stats['skipped'] += len(chunk) - len(filtered_chunk)
+                    if collect_mask:
+                        pack_mask(mask.to_numpy(dtype=bool))
+                    del chunk, filtered_chunk
+                    if text is not None and not put(write_queue, text):
+                        return
+                put(write_queue, done)
+            except Exception as e:
+                errors.append(e)
+                stop.set()
+        
+        stats = {'chunks': 0, 'captured': 0, 'skipped': 0}
+        stream = BlockStream(queue_depth * 2 * read_block, stop)
+        schema = {}
+        packed_masks = []
+        pending_mask = [np.zeros(0, dtype=bool)]
+        
+        def pack_mask(mask):
+            # Pack whole bytes as we go; carry the remainder to the next chunk
+            bits = np.concatenate([pending_mask[0], mask])
+            whole = len(bits) - len(bits) % 8
+            packed_masks.append(np.packbits(bits[:whole]))
+            pending_mask[0] = bits[whole:]
+        
+        stages = [
+            threading.Thread(target=fetch_stage, daemon=True),
+            threading.Thread(target=reader_stage, daemon=True),
+            threading.Thread(target=filter_stage, daemon=True),
+        ]
+        for stage in stages:
+            stage.start()
+        
+        # Writer stage runs on the calling thread
+        try:
+            with open(output_file, 'w', encoding='utf-8-sig', newline='') as out:
+                header_written = False
+                while True:
+                    text = get(write_queue)
+                    if text is done:
+                        break
+                    with write_slots:
+                        out.write(text)
+                    header_written = True
+                
+                if not header_written and not errors:
+                    # No data rows at all: keep the header
+                    header = pd.read_csv(input_file, nrows=0, encoding='utf-8-sig')
+                    self.filter_chunk(header, input_file)
+                    header.to_csv(out, index=False)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            stop.set()
+            for stage in stages:
+                stage.join()
+        
+        if errors:
+            raise errors[0]
+        
+        kept_bitmap = None
+        if collect_mask:
+            kept_bitmap = np.concatenate(packed_masks + [np.packbits(pending_mask[0])])
+        
+        return stats['captured'], stats['skipped'], kept_bitmap
+    
+    def record_spans(self, block, parity=0, final=False):
+        """Return (starts, ends, consumed) for the non-blank CSV records in a byte block"""
+        # `parity` is 1 if the block starts inside a quoted field.
+        # Newlines inside a quoted field don't end the record.
+        # uint8 wraps at 256, which keeps the parity intact.
+        in_quotes = (np.cumsum(block == 34, dtype=np.uint8) + parity) & 1
+        ends = np.flatnonzero((block == 10) & (in_quotes == 0)) + 1
+        if final and (len(ends) == 0 or ends[-1] != len(block)):
+            ends = np.append(ends, len(block))
+        if len(ends) == 0:
+            return ends, ends, 0
+        starts = np.r_[0, ends[:-1]]
+        
+        # pandas skips lines that are empty or whitespace only
+        content = np.r_[0, np.cumsum(~np.isin(block, (9, 10, 13, 32)), dtype=np.uint32)]
+        keep = content[ends] != content[starts]
+        return starts[keep], ends[keep], int(ends[-1])
+    
+    def scan_kept_offsets(self, input_file, kept_bitmap, total_rows, starts_out, ends_out,
+                          block_size=8 * 1024 * 1024, max_record=64 * 1024 * 1024):
+        """Fill starts_out/ends_out with kept-row byte spans and return the header end"""
+        file_size = os.path.getsize(input_file)
+        if file_size == 0:
+            raise ValueError(f"{os.path.basename(input_file)} is empty")
+        
+        def mismatch(records):
+            return ValueError(
+                f"Row index mismatch for {os.path.basename(input_file)}: "
+                f"{records} records vs {total_rows:,} parsed rows"
+            )
+        
+        # One block at a time, so memory stays at a block plus the output arrays
+        data = np.memmap(input_file, dtype=np.uint8, mode='r')
+        header_end = None
+        pos = 0
+        row = 0
+        kept = 0
+        size = block_size
+        
+        try:
+            while pos < file_size:
+                block = data[pos:pos + size]
+                starts, ends, consumed = self.record_spans(block, final=pos + len(block) >= file_size)
+                if consumed == 0:
+                    # One record is longer than the block; widen it, within reason
+                    if size >= max_record:
+                        raise ValueError(
+                            f"Unbalanced quotes in {os.path.basename(input_file)} near byte {pos:,}"
+                        )
+                    size *= 2
+                    continue
+                size = block_size
+                
+                if header_end is None and len(starts):
+                    header_end = pos + int(ends[0])
+                    starts, ends = starts[1:], ends[1:]
+                
+                count = len(starts)
+                if row + count > total_rows:
+                    raise mismatch(f"more than {total_rows:,}")
+                first_byte = row // 8
+                bits = np.unpackbits(kept_bitmap[first_byte:(row + count + 7) // 8 + 1])
+                keep = bits[row % 8:row % 8 + count].astype(bool)
+                
+                kept_count = int(keep.sum())
+                if kept + kept_count > len(starts_out):
+                    raise mismatch(f"{row + count:,}+")
+                starts_out[kept:kept + kept_count] = starts[keep] + pos
+                ends_out[kept:kept + kept_count] = ends[keep] + pos
+                
+                row += count
+                kept += kept_count
+                pos += consumed
+        finally:
+            del data
+        
+        if header_end is None:
+            raise ValueError(f"{os.path.basename(input_file)} has no header row")
+        if row != total_rows or kept != len(starts_out):
+            raise mismatch(f"{row:,}")
+        return header_end
+    
+    def row_index_path(self, output_file):
+        """Sidecar index path for an output file"""
+        return str(Path(output_file).with_suffix('.rowidx.npz'))
+    
+    def write_row_index_file(self, input_file, output_file, kept_bitmap, total_rows, kept_rows):
+        """Save a kept-row bitmap and byte offsets next to the output file"""
+        index_file = self.row_index_path(output_file)
+        # Offsets go to temporary memmaps, so large inputs don't need them in RAM
+        temp_files = [f"{index_file}.starts.tmp.npy", f"{index_file}.ends.tmp.npy"]
+        offsets = []
+        
+        try:
+            for temp_file in temp_files:
+                if kept_rows:
+                    offsets.append(np.lib.format.open_memmap(
+                        temp_file, mode='w+', dtype=np.int64, shape=(kept_rows,)
+                    ))
+                else:
+                    offsets.append(np.zeros(0, dtype=np.int64))
+            row_starts, row_ends = offsets
+            
+            header_end = self.scan_kept_offsets(input_file, kept_bitmap, total_rows, row_starts, row_ends)
+            
+            stat = os.stat(input_file)
+            np.savez_compressed(
+                index_file,
+                input_file=np.array(os.path.abspath(input_file)),
+                input_size=np.int64(stat.st_size),
+                input_mtime_ns=np.int64(stat.st_mtime_ns),
+                total_rows=np.int64(total_rows),
+                header_end=np.int64(header_end),
+                bitmap=kept_bitmap,
+                starts=row_starts,
+                ends=row_ends
+            )
+        except Exception:
+            if os.path.exists(index_file):
+                os.remove(index_file)
+            raise
+        finally:
+            # Release the maps before deleting their files (required on Windows)
+            del offsets[:]
+            row_starts = row_ends = None
+            gc.collect()
+            for temp_file in temp_files:
+                if os.path.exists(temp_file):
+                    os.remove(temp_file)
+        
+        return index_file
+    
+    def load_row_index(self, index_file):
+        """Load a sidecar index and check the input file hasn't changed"""
+        with np.load(index_file) as npz:
+            index = {key: npz[key] for key in npz.files}
+        
+        input_file = str(index['input_file'])
+        if not os.path.exists(input_file):
+            raise ValueError(f"Indexed input not found: {input_file}")
+        stat = os.stat(input_file)
+        if stat.st_size != index['input_size'] or stat.st_mtime_ns != index['input_mtime_ns']:
+            raise ValueError(f"{os.path.basename(input_file)} changed since the index was written")
+        
+        index['input_file'] = input_file
+        index['kept_rows'] = len(index['starts'])
+        return index
+    
+    def read_indexed_rows(self, index, rows=None, columns=None):
+        """Read kept rows (by position) straight from the input using the sidecar index"""
+        starts = index['starts']
+        ends = index['ends']
+        if rows is not None:
+            starts = starts[rows]
+            ends = ends[rows]
+        
+        buffer = io.BytesIO()
+        with open(index['input_file'], 'rb') as f:
+            buffer.write(f.read(int(index['header_end'])))
+            
+            if len(starts):
+                # Coalesce adjacent rows into contiguous reads
+                breaks = np.flatnonzero(starts[1:] != ends[:-1]) + 1
+                run_starts = starts[np.r_[0, breaks]]
+                run_ends = ends[np.r_[breaks - 1, len(ends) - 1]]
+                for run_start, run_end in zip(run_starts, run_ends):
+                    f.seek(int(run_start))
+                    chunk = f.read(int(run_end - run_start))
+                    if not chunk.endswith(b'\n'):
+                        chunk += b'\n'
+                    buffer.write(chunk)
+        
+        # Text as-is, so every batch of an export formats the same way
+        buffer.seek(0)
+        return pd.read_csv(
+            buffer,
+            encoding='utf-8-sig',
+            engine='c',
+            low_memory=False,
+            dtype=str,
+            keep_default_na=False,
+            usecols=columns
+        )
+    
+    def export_indexed_rows(self, index_file, output_file, columns=None, batch_rows=50000):
+        """Re-export the kept rows of an indexed file, optionally with other columns"""
+        index = self.load_row_index(index_file)
+        kept_rows = index['kept_rows']
+        
+        for batch_start in range(0, max(kept_rows, 1), batch_rows):
+            batch = self.read_indexed_rows(
+                index,
+                rows=slice(batch_start, batch_start + batch_rows),
+                columns=columns
+            )
+            batch.to_csv(
+                output_file,
+                mode='w' if batch_start == 0 else 'a',
+                header=batch_start == 0,
+                index=False,
+                encoding='utf-8-sig' if batch_start == 0 else 'utf-8'
+            )
+        
+        return kept_rows
+    
+    def estimate_csv(self, input_file, options=None, strata=32, block_size=256 * 1024, seed=0):
+        """Estimate a run from a stratified sample of byte ranges, writing nothing"""
+        options = options or {}
+        start_time = time.time()
+        file_size = os.path.getsize(input_file)
+        
+        with open(input_file, 'rb') as f:
+            header_line = f.readline()
+        header_end = len(header_line)
+        columns = pd.read_csv(io.BytesIO(header_line), nrows=0, encoding='utf-8-sig').columns
+        self.filter_chunk(pd.DataFrame(columns=columns), input_file)
+        
+        data_size = file_size - header_end
+        
+        def result(rows=0.0, rows_bound=0.0, kept=0.0, kept_bound=0.0, skipped=0.0,
+                   skipped_bound=0.0, output_size=header_end, output_bound=0.0,
+                   projected_time=0.0, sampled_bytes=0, excluded_blocks=0, exact=True):
+            return {
+                'input_file': os.path.basename(input_file),
+                'input_size': file_size,
+                'sampled_bytes': sampled_bytes,
+                'excluded_blocks': excluded_blocks,
+                'exact': exact,
+                'total_rows': rows,
+                'total_rows_bound': rows_bound,
+                'kept_rows': kept,
+                'kept_rows_bound': kept_bound,
+                'skipped_rows': skipped,
+                'skipped_rows_bound': skipped_bound,
+                'output_size': output_size,
+                'output_size_bound': output_bound,
+                'projected_time': projected_time,
+                'sample_time': time.time() - start_time
+            }
+        
+        # Header only: a real run writes just the header
+        if data_size == 0:
+            return result()
+        
+        # One random block per equal stratum; the spread across strata gives
+        # ~95% bounds. Small files are read in full and the counts are exact.
+        exact = data_size <= strata * block_size
+        if exact:
+            strata = 1
+            block_size = max(data_size, 1)
+        stratum_size = max(data_size, 1) / strata
+        rng = np.random.default_rng(seed)
+        
+        # Compact dtypes change the parse cost, so sample with them too
+        compact = options.get('compact_dtypes', False)
+        compact_dtype = None
+        compact_time = 0.0
+        if compact:
+            t0 = time.time()
+            compact_dtype = self.infer_compact_dtypes(input_file) or None
+            compact_time = time.time() - t0
+        
+        def parse(piece):
+            chunk = pd.read_csv(
+                io.BytesIO(piece),
+                header=None,
+                names=columns,
+                encoding='utf-8',
+                encoding_errors='replace',
+                engine='c',
+                low_memory=False,
+                na_values=['', ' ', '  '],
+                keep_default_na=True,
+                dtype=compact_dtype
+            )
+            return self.downcast_integers(chunk) if compact else chunk
+        
+        rows, kept, out_bytes = [], [], []
+        kept_offsets = []
+        sampled_bytes = 0
+        sampled_written = 0
+        excluded_blocks = 0
+        read_time = parse_time = write_time = count_time = scan_time = 0.0
+        
+        with open(input_file, 'rb') as f:
+            for i in range(strata):
+                stratum_start = header_end + int(i * stratum_size)
+                slack = max(0, int(stratum_size) - block_size)
+                offset = stratum_start + (int(rng.integers(0, slack + 1)) if slack and not exact else 0)
+                
+                t0 = time.time()
+                f.seek(offset)
+                block = f.read(block_size)
+                read_time += time.time() - t0
+                end_pos = offset + len(block)
+                
+                # Align to whole records. A random offset may land inside a
+                # quoted multi-line field, so try both quote parities and keep
+                # the first that parses cleanly; skip the block if neither does.
+                raw = np.frombuffer(block, dtype=np.uint8)
+                chunk = None
+                for parity in ((0,) if offset == header_end else (0, 1)):
+                    t0 = time.time()
+                    starts, ends, consumed = self.record_spans(raw, parity, final=end_pos >= file_size)
+                    if parity == 0:
+                        # Same scan as the row index pass (scan_kept_offsets)
+                        scan_time += time.time() - t0
+                    if offset > header_end and len(starts) and starts[0] == 0:
+                        starts = starts[1:]  # Tail of a record that began before the block
+                    if not len(starts):
+                        continue
+                    piece = block[int(starts[0]):consumed]
+                    
+                    t0 = time.time()
+                    try:
+                        chunk = parse(piece)
+                    except pd.errors.ParserError:
+                        continue
+                    filtered_chunk, mask = self.filter_chunk(chunk, input_file)
+                    parse_time += time.time() - t0
+                    if len(starts) == len(chunk):
+                        kept_offsets.append(starts[mask.to_numpy(dtype=bool)] + offset)
+                    break
+                
+                if chunk is None:
+                    if block.strip():
+                        excluded_blocks += 1
+                    continue
+                block = piece
+                sampled_bytes += len(block)
+                
+                # The count itself is discarded: this only times a line-count
+                # pass, to model the row-count pass in process_single_csv
+                t0 = time.time()
+                sum(1 for line in io.TextIOWrapper(io.BytesIO(block), encoding='utf-8', errors='replace'))
+                count_time += time.time() - t0
+                
+                t0 = time.time()
+                written = len(filtered_chunk.to_csv(index=False, header=False).encode('utf-8'))
+                write_time += time.time() - t0
+                sampled_written += written
+                
+                # Scale this block up to the whole stratum
+                scale = stratum_size / len(block)
+                rows.append(len(chunk) * scale)
+                kept.append(len(filtered_chunk) * scale)
+                out_bytes.append(written * scale)
+        
+        if not rows:
+            if excluded_blocks:
+                raise ValueError(f"No sample block of {os.path.basename(input_file)} could be parsed")
+            # Only blank lines after the header
+            return result(projected_time=time.time() - start_time)
+        
+        rows = np.array(rows)
+        kept = np.array(kept)
+        out_bytes = np.array(out_bytes)
+        skipped = rows - kept
+        n = len(rows)
+        
+        def total_and_bound(values):
+            # Mean of per-stratum estimates times strata, with a 95% margin
+            total = values.mean() * strata
+            if exact or n < 2:
+                return total, 0.0
+            return total, 1.96 * values.std(ddof=1) * strata / np.sqrt(n)
+        
+        est_rows, rows_bound = total_and_bound(rows)
+        est_kept, kept_bound = total_and_bound(kept)
+        est_skipped, skipped_bound = total_and_bound(skipped)
+        est_output, output_bound = total_and_bound(out_bytes)
+        est_output += header_end
+        
+        # The count pass reads the whole input; the pipeline then overlaps disk
+        # reads with parsing/filtering/formatting, which share the GIL
+        per_byte_read = read_time / sampled_bytes
+        count_pass = data_size * (per_byte_read + count_time / sampled_bytes)
+        pipeline = max(
+            data_size * per_byte_read,
+            data_size * parse_time / sampled_bytes + est_output * write_time / max(sampled_written, 1)
+        )
+        projected_time = count_pass + pipeline
+        
+        # Dtype sampling reads a fixed number of rows, so its time is as measured
+        projected_time += compact_time
+        if options.get('write_row_index'):
+            # The index scan is a second full read of the input, and the kept
+            # offsets are then compressed into the .npz
+            projected_time += data_size * (per_byte_read + scan_time / sampled_bytes)
+            sample_offsets = np.concatenate(kept_offsets) if kept_offsets else np.zeros(0, dtype=np.int64)
+            if len(sample_offsets):
+                t0 = time.time()
+                np.savez_compressed(io.BytesIO(), starts=sample_offsets, ends=sample_offsets + 1)
+                projected_time += est_kept * (time.time() - t0) / len(sample_offsets)
+        
+        return result(
+            est_rows, rows_bound, est_kept, kept_bound, est_skipped, skipped_bound,
+            est_output, output_bound, projected_time, sampled_bytes, excluded_blocks, exact
+        )
+    
+    def process_single_csv(self, file_index, input_file, output_file, options=None, limiter=None):
+        """Process a single CSV file (optimized for parallel execution)"""
+        options = options or {}
+        limiter = limiter or ResourceLimiter(self.num_workers, options.get('io_per_device', 2))
+        # Write beside the output and swap it in at the end, so a failed run
+        # leaves no half-written file and output == input can't truncate the input
+        temp_output = f"{output_file}.tmp"
+        try:
+            start_time = time.time()
+            self.set_file_status(file_index, "🔄 Processing")
+            
+            # Read CSV with optimization
+            chunk_size = 50000  # Larger chunks for better performance
+            total_rows = 0
+            
+            # Quick row count
+            with limiter.io(input_file):
+                with open(input_file, 'r', encoding='utf-8-sig') as f:
+                    total_rows = sum(1 for line in f) - 1
+            
+            # Fail fast (and only once) when the filter column is missing
+            header = pd.read_csv(input_file, nrows=0, encoding='utf-8-sig')
+            self.filter_chunk(header, input_file)
+            
+            # Process chunks with optimized settings
+            compact = options.get('compact_dtypes', False)
+            dtype = {}
+            if compact:
+                with limiter.io(input_file):
+                    dtype = self.infer_compact_dtypes(input_file)
+            collect_mask = options.get('write_row_index', False)
+            queue_depth = 2  # Chunks buffered between pipeline stages
+            overrides = {}
+            while True:
+                try:
+                    captured_rows, skipped_rows, kept_bitmap = self.run_filter_pipeline(
+                        input_file, temp_output, chunk_size, {**dtype, **overrides} or None,
+                        collect_mask, queue_depth, limiter, downcast=compact
+                    )
+                    break
+                except SchemaConflict as e:
+                    # Rewrite with the conflicting columns typed from the start
+                    overrides.update(e.overrides)
+            
+            # Clean up
+            gc.collect()
+            
+            # Sidecar index of kept rows for later re-exports and previews.
+            # It's optional: a problem here doesn't fail the filtered output.
+            index_file = None
+            index_warning = None
+            if kept_bitmap is not None:
+                try:
+                    with limiter.io(input_file):
+                        index_file = self.write_row_index_file(
+                            input_file, output_file, kept_bitmap,
+                            captured_rows + skipped_rows, captured_rows
+                        )
+                except Exception as e:
+                    index_warning = str(e)
+                del kept_bitmap
+            
+            os.replace(temp_output, output_file)
+            processing_time = time.time() - start_time
+            
+            # Return statistics
+            return {
+                'file_index': file_index,
+                'input_file': os.path.basename(input_file),
+                'output_file': os.path.basename(output_file),
+                'total_rows': total_rows,
+                'captured_rows': captured_rows,
+                'skipped_rows': skipped_rows,
+                'index_file': os.path.basename(index_file) if index_file else None,
+                'index_warning': index_warning,
+                'processing_time': processing_time,
+                'success': True,
+                'error': None
+            }
+            
+        except Exception as e:
+            if os.path.exists(temp_output):
+                os.remove(temp_output)
+            return {
+                'file_index': file_index,
+                'input_file': os.path.basename(input_file),
+                'output_file': os.path.basename(output_file),
+                'success': False,
+                'error': str(e)
+            }
+    
+    def process_files_thread(self, valid_pairs, options=None):
+        """Process multiple CSV files concurrently (runs off the UI thread)"""
+        try:
+            overall_start = time.time()
+            total_files = len(valid_pairs)
+            options = options or {}
+            
+            self.progress_queue.put(("status", f"Processing {total_files} file(s) in parallel..."))
+            self.progress_queue.put(("progress_label", f"0/{total_files} files completed"))
+            
+            results = []
+            completed = 0
+            limiter = ResourceLimiter(self.num_workers, options.get('io_per_device', 2))
+            
+            # Files wait on the limiter rather than on the pool, so give each its own thread
+            with ThreadPoolExecutor(max_workers=total_files) as executor:
+                # Submit all tasks
+                future_to_file = {
+                    executor.submit(
+                        self.process_single_csv,
+                        file_index,
+                        input_file,
+                        output_file,
+                        options,
+                        limiter
+                    ): (file_index, input_file, output_file)
+                    for file_index, input_file, output_file in valid_pairs
+                }
+                
+                # Process completed tasks
+                for future in as_completed(future_to_file):
+                    file_index, input_file, output_file = future_to_file[future]
+                    
+                    try:
+                        result = future.result()
+                        results.append(result)
+                        
+                        if result['success']:
+                            self.set_file_status(file_index, "✅ Complete")
+                            status_msg = f"✅ File {file_index + 1}: {result['input_file']} - Captured {result['captured_rows']:,} rows"
+                        else:
+                            self.set_file_status(file_index, "❌ Error")
+                            status_msg = f"❌ File {file_index + 1}: {result['input_file']} - Error: {result['error']}"
+                        
+                        self.progress_queue.put(("status", status_msg))
+                        
+                    except Exception as e:
+                        self.set_file_status(file_index, "❌ Failed")
+                        self.progress_queue.put(("status", f"❌ File {file_index + 1} failed: {str(e)}"))
+                    
+                    completed += 1
+                    progress = (completed / total_files) * 100
+                    self.progress_queue.put(("progress", progress))
+                    self.progress_queue.put(("progress_label", f"{completed}/{total_files} files completed"))
+            
+            # Calculate overall statistics
+            overall_time = time.time() - overall_start
+            successful_files = sum(1 for r in results if r.get('success', False))
+            failed_files = len(results) - successful_files
+            
+            total_rows_all = sum(r.get('total_rows', 0) for r in results if r.get('success', False))
+            captured_rows_all = sum(r.get('captured_rows', 0) for r in results if r.get('success', False))
+            skipped_rows_all = sum(r.get('skipped_rows', 0) for r in results if r.get('success', False))
+            
+            # Generate detailed statistics
+            stats_text = f"""
+╔══════════════════════════════════════════════════════════╗
+║                   PROCESSING COMPLETE                      ║
+╚══════════════════════════════════════════════════════════╝
+
+📊 OVERALL STATISTICS:
+━━━━━━━━━━━━━━━━━━━━━━
+• Files Processed: {successful_files}/{total_files}
+• Failed Files: {failed_files}
+• Total Rows Processed: {total_rows_all:,}
+• Total Captured: {captured_rows_all:,}
+• Total Skipped: {skipped_rows_all:,}
+• Total Processing Time: {overall_time:.2f} seconds
+• Average Speed: {total_rows_all/overall_time:.0f} rows/second
+
+📁 FILE DETAILS:
+━━━━━━━━━━━━━━━"""
+            
+            for result in results:
+                if result.get('success', False):
+                    stats_text += f"""
+File: {result['input_file']}
+  ✅ Captured: {result['captured_rows']:,} | Skipped: {result['skipped_rows']:,}
+  ⏱️ Time: {result['processing_time']:.2f}s | Speed: {result['total_rows']/result['processing_time']:.0f} rows/s"""
+                    if result.get('index_file'):
+                        stats_text += f"""
+  🗂️ Row index: {result['index_file']}"""
+                    elif result.get('index_warning'):
+                        stats_text += f"""
+  ⚠️ Row index skipped: {result['index_warning']}"""
+                else:
+                    stats_text += f"""
+File: {result['input_file']}
+  ❌ Error: {result['error']}"""
+            
+            self.progress_queue.put(("stats", stats_text))
+            self.progress_queue.put(("complete", (successful_files, failed_files)))
+            
+        except Exception as e:
+            self.progress_queue.put(("error", str(e)))
+    
+    def dry_run_thread(self, valid_pairs, options=None):
+        """Estimate each file from a sample and report, without writing output"""
+        try:
+            total_files = len(valid_pairs)
+            self.progress_queue.put(("status", f"Sampling {total_files} file(s) for a dry run..."))
+            
+            report = f"""
+╔══════════════════════════════════════════════════════════╗
+║                   DRY RUN ESTIMATE                         ║
+╚══════════════════════════════════════════════════════════╝
+(± values are ~95% bounds; nothing was written)
+"""
+            completed = 0
+            failed = 0
+            for file_index, input_file, output_file in valid_pairs:
+                self.set_file_status(file_index, "🔎 Sampling")
+                try:
+                    est = self.estimate_csv(input_file, options)
+                    self.set_file_status(file_index, "🔎 Estimated")
+                    method = "exact (small file)" if est['exact'] else f"sampled {est['sampled_bytes'] / 1048576:.1f} MB"
+                    if est['excluded_blocks']:
+                        method += f", {est['excluded_blocks']} unparseable block(s) skipped"
+                    report += f"""
+File: {est['input_file']} ({est['input_size'] / 1048576:,.1f} MB, {method})
+  • Rows: {est['total_rows']:,.0f} ± {est['total_rows_bound']:,.0f}
+  ✅ Kept: {est['kept_rows']:,.0f} ± {est['kept_rows_bound']:,.0f} | Skipped: {est['skipped_rows']:,.0f} ± {est['skipped_rows_bound']:,.0f}
+  💾 Output: {est['output_size'] / 1048576:,.1f} MB ± {est['output_size_bound'] / 1048576:,.1f} MB
+  ⏱️ Projected time: {est['projected_time']:.1f}s (sampled in {est['sample_time']:.2f}s)"""
+                except Exception as e:
+                    failed += 1
+                    self.set_file_status(file_index, "❌ Error")
+                    report += f"""
+File: {os.path.basename(input_file)}
+  ❌ Error: {e}"""
+                
+                completed += 1
+                self.progress_queue.put(("progress", (completed / total_files) * 100))
+                self.progress_queue.put(("progress_label", f"{completed}/{total_files} files sampled"))
+            
+            self.progress_queue.put(("stats", report))
+            self.progress_queue.put(("dry_run_complete", (total_files - failed, failed)))
+            
+        except Exception as e:
+            self.progress_queue.put(("error", str(e)))
+    
+    def run_headless(self, valid_pairs, options=None, dry_run=False):
+        """Process files without a GUI, printing progress to stdout"""
+        target = self.dry_run_thread if dry_run else self.process_files_thread
+        worker = threading.Thread(target=target, args=(valid_pairs, options), daemon=True)
+        worker.start()
+        
+        while True:
+            msg_type, msg_data = self.progress_queue.get()
+            if msg_type in ("status", "stats"):
+                print(msg_data, flush=True)
+            elif msg_type in ("complete", "dry_run_complete"):
+                successful, failed = msg_data
+                worker.join()
+                return 1 if failed else 0
+            elif msg_type == "error":
+                print(f"An error occurred: {msg_data}", file=sys.stderr)
+                worker.join()
+                return 1
+
+class CSVFilterApp(CSVFilterEngine):
+    def __init__(self, root, num_workers=None):
+        super().__init__()
+        if num_workers is not None:
+            self.num_workers = num_workers
         self.root = root
         self.root.title("CSV Multi-Filter - Remove Empty First Names (Up to 5 Files)")
         
@@ -49,11 +1064,12 @@ class CSVFilterApp:
         self.input_files = [tk.StringVar() for _ in range(self.max_files)]
         self.output_files = [tk.StringVar() for _ in range(self.max_files)]
         self.file_status = [tk.StringVar(value="") for _ in range(self.max_files)]
-        self.progress_queue = queue.Queue()
         self.processing = False
         
-        # Get optimal number of workers
-        self.num_workers = min(multiprocessing.cpu_count(), 4)
+        # Processing options
+        self.compact_dtypes = tk.BooleanVar(value=False)
+        self.write_row_index = tk.BooleanVar(value=False)
+        self.io_per_device = tk.IntVar(value=2)
         
         # File entries and buttons storage
         self.input_entries = []
@@ -156,9 +1172,68 @@ class CSVFilterApp:
         for i in range(self.max_files):
             self.create_file_row(files_frame, i)
         
+        # Options section
+        options_frame = tk.LabelFrame(
+            main_frame,
+            text="Options",
+            font=self.main_font,
+            bg=self.bg_color,
+            fg=self.fg_color,
+            relief=tk.GROOVE,
+            bd=2
+        )
+        options_frame.grid(row=3, column=0, sticky="ew", padx=10, pady=10)
+        
+        tk.Checkbutton(
+            options_frame,
+            text="Compact column types (smaller memory per chunk)",
+            variable=self.compact_dtypes,
+            font=self.small_font,
+            bg=self.bg_color,
+            fg=self.fg_color,
+            activebackground=self.bg_color,
+            selectcolor=self.entry_bg
+        ).grid(row=0, column=0, sticky="w", padx=10, pady=5)
+        
+        tk.Checkbutton(
+            options_frame,
+            text="Write kept-row index sidecar (.rowidx.npz)",
+            variable=self.write_row_index,
+            font=self.small_font,
+            bg=self.bg_color,
+            fg=self.fg_color,
+            activebackground=self.bg_color,
+            selectcolor=self.entry_bg
+        ).grid(row=1, column=0, sticky="w", padx=10, pady=5)
+        
+        io_frame = tk.Frame(options_frame, bg=self.bg_color)
+        io_frame.grid(row=2, column=0, sticky="w", padx=10, pady=5)
+        
+        tk.Label(
+            io_frame,
+            text="Concurrent disk reads/writes per drive:",
+            font=self.small_font,
+            bg=self.bg_color,
+            fg=self.fg_color
+        ).grid(row=0, column=0, padx=(0, 5))
+        
+        tk.Spinbox(
+            io_frame,
+            from_=1,
+            to=8,
+            textvariable=self.io_per_device,
+            font=self.small_font,
+            bg=self.entry_bg,
+            fg=self.fg_color,
+            relief=tk.SOLID,
+            bd=1,
+            width=4,
+            state="readonly"
+        ).grid(row=0, column=1)
+        
         # Control buttons frame
         control_frame = tk.Frame(main_frame, bg=self.bg_color)
-        control_frame.grid(row=3, column=0, pady=15)
+        control_frame.grid(row=4, column=0, pady=15)
         
         # Clear All button
         self.clear_all_btn = self.create_button(
@@ -188,6 +1263,15 @@ class CSVFilterApp:
         )
         self.autofill_btn.grid(row=0, column=2, padx=5)
         
+        # Dry run button
+        self.dry_run_btn = self.create_button(
+            control_frame,
+            "Dry Run",
+            self.dry_run_all_csv,
+            width=10
+        )
+        self.dry_run_btn.grid(row=0, column=3, padx=5)
+        
         # Overall progress bar
         progress_frame = tk.LabelFrame(
             main_frame,
@@ -198,7 +1282,7 @@ class CSVFilterApp:
             relief=tk.GROOVE,
             bd=2
         )
-        progress_frame.grid(row=4, column=0, sticky="ew", padx=10, pady=10)
+        progress_frame.grid(row=5, column=0, sticky="ew", padx=10, pady=10)
         
         self.progress_var = tk.DoubleVar()
         self.progress_bar = ttk.Progressbar(
@@ -228,7 +1312,7 @@ class CSVFilterApp:
             relief=tk.GROOVE,
             bd=2
         )
-        stats_frame.grid(row=5, column=0, sticky="ew", padx=10, pady=10)
+        stats_frame.grid(row=6, column=0, sticky="ew", padx=10, pady=10)
         stats_frame.columnconfigure(0, weight=1)
         
         # Create scrolled text for statistics
@@ -253,7 +1337,7 @@ class CSVFilterApp:
         
         # Credits section with gray background
         credits_frame = tk.Frame(main_frame, bg=self.accent_color, relief=tk.RAISED, bd=1)
-        credits_frame.grid(row=6, column=0, sticky="ew", padx=10, pady=(20, 10))
+        credits_frame.grid(row=7, column=0, sticky="ew", padx=10, pady=(20, 10))
         
         credits_text = """Enhanced Multi-File Version | Developed By: Nader Mahbub Khan
 Software Engineer | Web Developer
@@ -465,11 +1549,11 @@ Phone: 01642817116 | Email: muhammadnadermahbubkhan@gmail.com"""
                 output_path = input_path.parent / f"{input_path.stem}_filtered.csv"
                 self.output_files[i].set(str(output_path))
     
-    def get_valid_file_pairs(self):
+    def get_valid_file_pairs(self, require_output=True):
         """Get list of valid input/output file pairs"""
         valid_pairs = []
         for i in range(self.max_files):
-            if self.input_files[i].get() and self.output_files[i].get():
+            if self.input_files[i].get() and (self.output_files[i].get() or not require_output):
                 if not os.path.exists(self.input_files[i].get()):
                     self.file_status[i].set("❌ Not Found")
                     continue
@@ -490,202 +1574,52 @@ Phone: 01642817116 | Email: muhammadnadermahbubkhan@gmail.com"""
         
         self.processing = True
         self.process_btn.config(state=tk.DISABLED, text="Processing...")
+        self.dry_run_btn.config(state=tk.DISABLED)
         self.stats_text.delete(1.0, tk.END)
         self.progress_var.set(0)
         
         # Start processing in separate thread
-        thread = threading.Thread(target=self.process_files_thread, args=(valid_pairs,), daemon=True)
+        options = self.get_processing_options()
+        thread = threading.Thread(target=self.process_files_thread, args=(valid_pairs, options), daemon=True)
         thread.start()
         
         # Start monitoring progress
         self.monitor_progress()
     
-    def process_single_csv(self, file_index, input_file, output_file):
-        """Process a single CSV file (optimized for parallel execution)"""
-        try:
-            start_time = time.time()
-            self.file_status[file_index].set("🔄 Processing")
-            
-            # Read CSV with optimization
-            chunk_size = 50000  # Larger chunks for better performance
-            total_rows = 0
-            captured_rows = 0
-            skipped_rows = 0
-            
-            # Quick row count
-            with open(input_file, 'r', encoding='utf-8-sig') as f:
-                total_rows = sum(1 for line in f) - 1
-            
-            # Process chunks with optimized settings
-            filtered_chunks = []
-            
-            # Use engine='c' for faster parsing
-            reader = pd.read_csv(
-                input_file,
-                chunksize=chunk_size,
-                encoding='utf-8-sig',
-                engine='c',  # C engine is faster
-                low_memory=False,
-                na_values=['', ' ', '  '],
-                keep_default_na=True
-            )
-            
-            for chunk in reader:
-                if 'First Name' in chunk.columns:
-                    # Vectorized operation for better performance
-                    first_name_col = chunk['First Name']
-                    mask = first_name_col.notna() & (first_name_col.astype(str).str.strip() != '')
-                    filtered_chunk = chunk.loc[mask]
-                    
-                    captured_rows += len(filtered_chunk)
-                    skipped_rows += len(chunk) - len(filtered_chunk)
-                    
-                    if not filtered_chunk.empty:
-                        filtered_chunks.append(filtered_chunk)
-                else:
-                    raise ValueError(f"Column 'First Name' not found in {os.path.basename(input_file)}")
-            
-            # Combine and save with optimization
-            if filtered_chunks:
-                result_df = pd.concat(filtered_chunks, ignore_index=True)
-                # Use faster CSV writing
-                result_df.to_csv(
-                    output_file,
-                    index=False,
-                    encoding='utf-8-sig',
-                    chunksize=chunk_size  # Write in chunks too
-                )
-                del result_df
-            else:
-                pd.DataFrame(columns=chunk.columns).to_csv(
-                    output_file,
-                    index=False,
-                    encoding='utf-8-sig'
-                )
-            
-            # Clean up
-            del filtered_chunks
-            gc.collect()
-            
-            processing_time = time.time() - start_time
-            
-            # Return statistics
-            return {
-                'file_index': file_index,
-                'input_file': os.path.basename(input_file),
-                'output_file': os.path.basename(output_file),
-                'total_rows': total_rows,
-                'captured_rows': captured_rows,
-                'skipped_rows': skipped_rows,
-                'processing_time': processing_time,
-                'success': True,
-                'error': None
-            }
-            
-        except Exception as e:
-            return {
-                'file_index': file_index,
-                'input_file': os.path.basename(input_file),
-                'output_file': os.path.basename(output_file),
-                'success': False,
-                'error': str(e)
-            }
+    def dry_run_all_csv(self):
+        """Estimate kept rows, output size and runtime without writing anything"""
+        if self.processing:
+            return
+        
+        valid_pairs = self.get_valid_file_pairs(require_output=False)
+        
+        if not valid_pairs:
+            messagebox.showerror("Error", "No valid input files found. Please select at least one input file.")
+            return
+        
+        self.processing = True
+        self.process_btn.config(state=tk.DISABLED)
+        self.dry_run_btn.config(state=tk.DISABLED, text="Sampling...")
+        self.stats_text.delete(1.0, tk.END)
+        self.progress_var.set(0)
+        
+        options = self.get_processing_options()
+        thread = threading.Thread(target=self.dry_run_thread, args=(valid_pairs, options), daemon=True)
+        thread.start()
+        
+        self.monitor_progress()
     
-    def process_files_thread(self, valid_pairs):
-        """Process multiple CSV files in parallel threads"""
-        try:
-            overall_start = time.time()
-            total_files = len(valid_pairs)
-            
-            self.progress_queue.put(("status", f"Processing {total_files} file(s) in parallel..."))
-            self.progress_queue.put(("progress_label", f"0/{total_files} files completed"))
-            
-            results = []
-            completed = 0
-            
-            # Use ThreadPoolExecutor for parallel processing
-            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
-                # Submit all tasks
-                future_to_file = {
-                    executor.submit(
-                        self.process_single_csv, 
-                        file_index, 
-                        input_file, 
-                        output_file
-                    ): (file_index, input_file, output_file)
-                    for file_index, input_file, output_file in valid_pairs
-                }
-                
-                # Process completed tasks
-                for future in as_completed(future_to_file):
-                    file_index, input_file, output_file = future_to_file[future]
-                    
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        
-                        if result['success']:
-                            self.file_status[file_index].set("✅ Complete")
-                            status_msg = f"✅ File {file_index + 1}: {result['input_file']} - Captured {result['captured_rows']:,} rows"
-                        else:
-                            self.file_status[file_index].set("❌ Error")
-                            status_msg = f"❌ File {file_index + 1}: {result['input_file']} - Error: {result['error']}"
-                        
-                        self.progress_queue.put(("status", status_msg))
-                        
-                    except Exception as e:
-                        self.file_status[file_index].set("❌ Failed")
-                        self.progress_queue.put(("status", f"❌ File {file_index + 1} failed: {str(e)}"))
-                    
-                    completed += 1
-                    progress = (completed / total_files) * 100
-                    self.progress_queue.put(("progress", progress))
-                    self.progress_queue.put(("progress_label", f"{completed}/{total_files} files completed"))
-            
-            # Calculate overall statistics
-            overall_time = time.time() - overall_start
-            successful_files = sum(1 for r in results if r.get('success', False))
-            failed_files = len(results) - successful_files
-            
-            total_rows_all = sum(r.get('total_rows', 0) for r in results if r.get('success', False))
-            captured_rows_all = sum(r.get('captured_rows', 0) for r in results if r.get('success', False))
-            skipped_rows_all = sum(r.get('skipped_rows', 0) for r in results if r.get('success', False))
-            
-            # Generate detailed statistics
-            stats_text = f"""
-╔══════════════════════════════════════════════════════════╗
-║                   PROCESSING COMPLETE                      ║
-╚══════════════════════════════════════════════════════════╝
-
-📊 OVERALL STATISTICS:
-━━━━━━━━━━━━━━━━━━━━━━
-• Files Processed: {successful_files}/{total_files}
-• Failed Files: {failed_files}
-• Total Rows Processed: {total_rows_all:,}
-• Total Captured: {captured_rows_all:,}
-• Total Skipped: {skipped_rows_all:,}
-• Total Processing Time: {overall_time:.2f} seconds
-• Average Speed: {total_rows_all/overall_time:.0f} rows/second
-
-📁 FILE DETAILS:
-━━━━━━━━━━━━━━━"""
-            
-            for result in results:
-                if result.get('success', False):
-                    stats_text += f"""
-File: {result['input_file']}
-  ✅ Captured: {result['captured_rows']:,} | Skipped: {result['skipped_rows']:,}
-  ⏱️ Time: {result['processing_time']:.2f}s | Speed: {result['total_rows']/result['processing_time']:.0f} rows/s"""
-                else:
-                    stats_text += f"""
-File: {result['input_file']}
-  ❌ Error: {result['error']}"""
-            
-            self.progress_queue.put(("stats", stats_text))
-            self.progress_queue.put(("complete", (successful_files, failed_files)))
-            
-        except Exception as e:
-            self.progress_queue.put(("error", str(e)))
+    def set_file_status(self, file_index, status):
+        """Show per-file status next to the file row"""
+        self.file_status[file_index].set(status)
+    
+    def get_processing_options(self):
+        """Snapshot processing options from the UI (call from the main thread)"""
+        return {
+            'compact_dtypes': self.compact_dtypes.get(),
+            'write_row_index': self.write_row_index.get(),
+            'io_per_device': self.io_per_device.get(),
+        }
     
     def monitor_progress(self):
         """Monitor progress from the processing thread"""
@@ -707,6 +1641,7 @@ File: {result['input_file']}
                     successful, failed = msg_data
                     self.processing = False
                     self.process_btn.config(state=tk.NORMAL, text="Process All Files")
+                    self.dry_run_btn.config(state=tk.NORMAL)
                     self.progress_label.config(text="Complete!")
                     
                     if failed > 0:
@@ -720,9 +1655,16 @@ File: {result['input_file']}
                             f"All {successful} file(s) processed successfully!"
                         )
                     return
+                elif msg_type == "dry_run_complete":
+                    self.processing = False
+                    self.process_btn.config(state=tk.NORMAL)
+                    self.dry_run_btn.config(state=tk.NORMAL, text="Dry Run")
+                    self.progress_label.config(text="Dry run complete - no files written")
+                    return
                 elif msg_type == "error":
                     self.processing = False
                     self.process_btn.config(state=tk.NORMAL, text="Process All Files")
+                    self.dry_run_btn.config(state=tk.NORMAL, text="Dry Run")
                     self.progress_label.config(text="Error!")
                     messagebox.showerror("Error", f"An error occurred: {msg_data}")
                     return
@@ -734,6 +1676,69 @@ File: {result['input_file']}
 
 def main():
     """Main function to run the application"""
+    parser = argparse.ArgumentParser(description="Remove rows with an empty First Name from CSV files")
+    parser.add_argument('inputs', nargs='*', help="Input CSV files (pre-filled in the GUI unless --headless)")
+    parser.add_argument('--headless', '--no-gui', action='store_true', help="Process the inputs without opening the GUI")
+    parser.add_argument('--compact-dtypes', action='store_true', help="Read with compact column types")
+    parser.add_argument('--row-index', action='store_true', help="Write a kept-row index sidecar")
+    parser.add_argument('--workers', type=int, help="Concurrent CPU slots for parsing, filtering and formatting")
+    parser.add_argument('--io-per-device', type=int, default=2, help="Concurrent disk reads/writes per drive")
+    parser.add_argument('--dry-run', action='store_true', help="Estimate kept rows, output size and time without writing")
+    parser.add_argument('--from-index', metavar='INDEX', help="Re-export the kept rows recorded in a .rowidx.npz sidecar")
+    parser.add_argument('--columns', help="Comma-separated columns to re-export (with --from-index)")
+    parser.add_argument('--output', help="Output CSV for --from-index")
+    args = parser.parse_args()
+    
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.io_per_device < 1:
+        parser.error("--io-per-device must be at least 1")
+    if args.headless and not args.inputs:
+        parser.error("--headless needs at least one input CSV file")
+    if args.dry_run and not args.headless:
+        parser.error("--dry-run needs --headless (use the Dry Run button in the GUI)")
+    if args.from_index and (args.inputs or args.dry_run):
+        parser.error("--from-index doesn't take input files or --dry-run")
+    if args.from_index and not args.output:
+        parser.error("--from-index needs --output")
+    if (args.columns or args.output) and not args.from_index:
+        parser.error("--columns and --output need --from-index")
+    
+    if args.from_index:
+        engine = CSVFilterEngine()
+        columns = [c.strip() for c in args.columns.split(',')] if args.columns else None
+        try:
+            kept_rows = engine.export_indexed_rows(args.from_index, args.output, columns)
+        except Exception as e:
+            print(f"❌ {os.path.basename(args.from_index)}: {e}", file=sys.stderr)
+            sys.exit(1)
+        print(f"✅ Re-exported {kept_rows:,} rows to {args.output}")
+        sys.exit(0)
+    
+    if args.headless:
+        engine = CSVFilterEngine()
+        if args.workers is not None:
+            engine.num_workers = args.workers
+        
+        # Outputs are named like Auto-Fill Outputs does in the GUI
+        valid_pairs = []
+        for i, input_file in enumerate(args.inputs):
+            if not os.path.exists(input_file):
+                print(f"❌ Not found: {input_file}", file=sys.stderr)
+                continue
+            input_path = Path(input_file)
+            output_path = input_path.parent / f"{input_path.stem}_filtered.csv"
+            valid_pairs.append((i, input_file, str(output_path)))
+        
+        if not valid_pairs:
+            sys.exit(1)
+        
+        sys.exit(engine.run_headless(valid_pairs, {
+            'compact_dtypes': args.compact_dtypes,
+            'write_row_index': args.row_index,
+            'io_per_device': args.io_per_device,
+        }, dry_run=args.dry_run))
+    
     root = tk.Tk()
     
     # Set window icon (optional)
@@ -742,7 +1747,15 @@ def main():
     except:
         pass
     
-    app = CSVFilterApp(root)
+    app = CSVFilterApp(root, num_workers=args.workers)
+    
+    # Files dropped on the exe or opened via a file association
+    app.compact_dtypes.set(args.compact_dtypes)
+    app.write_row_index.set(args.row_index)
+    app.io_per_device.set(args.io_per_device)
+    for i, input_file in enumerate(args.inputs[:app.max_files]):
+        app.input_files[i].set(os.path.abspath(input_file))
+    app.autofill_outputs()
     
     # Bind mousewheel to canvas for scrolling
     def on_mousewheel(event):